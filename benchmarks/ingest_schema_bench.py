@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire du schéma d'ingestion typé sur une couche synthétique
+de taille provinciale (colonnes objet vs catégories / entiers réduits).
+
+Usage: python benchmarks/ingest_schema_bench.py [nombre_de_lignes]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sync_government_data import apply_ingest_schema, normalize_text, valdor_mask  # noqa: E402
+
+MRC_VALUES = [
+    "La Vallée-de-l'Or (08)",
+    "Rouyn-Noranda (08)",
+    "Montréal (06)",
+    "Québec (03)",
+    "Longueuil (16)",
+    "Sherbrooke (05)",
+]
+ETAT_VALUES = ['Terminée', 'Non terminée', 'Non nécessaire', '']
+MILIEU_VALUES = ['Sol', 'Eau souterraine', 'Sol, Eau souterraine', '']
+QUAL_VALUES = ['<= A', 'A-B', 'B-C', '> C', 'Plage B-C', '']
+
+
+def generate_layer(count, seed=42):
+    """Générer une couche synthétique combinant les colonnes 'point' et 'detailsFiches'"""
+    rng = np.random.default_rng(seed)
+    cities = np.array(["Val-d'Or", 'Montréal', 'Québec', 'Laval', 'Gatineau'])
+    return pd.DataFrame({
+        'NO_MEF_LIEU': [str(7000000 + i) for i in range(count)],
+        'NO_SEQ_DOSSIER': [str(v) for v in rng.integers(1, 200000, count)],
+        'ADR_CIV_LIEU': [
+            f"{n} rue Principale, {c}"
+            for n, c in zip(rng.integers(1, 9999, count), rng.choice(cities, count))
+        ],
+        'LST_MRC_REG_ADM': rng.choice(MRC_VALUES, count).astype(object),
+        'ETAT_REHAB': rng.choice(ETAT_VALUES, count).astype(object),
+        'DESC_MILIEU_RECEPT': rng.choice(MILIEU_VALUES, count).astype(object),
+        'QUAL_SOLS': rng.choice(QUAL_VALUES, count).astype(object),
+        'QUAL_SOLS_AV': rng.choice(QUAL_VALUES, count).astype(object),
+        'NB_FICHES': rng.integers(1, 12, count).astype(np.int64),
+        'DATE_CRE_MAJ': generate_dates(rng, count),
+    })
+
+
+def generate_dates(rng, count):
+    """Dates en formats mixtes: jour seul, date-heure et décalages -05:00 / -04:00"""
+    dates = pd.to_datetime(rng.integers(946684800, 1735689600, count), unit='s')
+    formats = rng.integers(0, 4, count)
+    return np.where(
+        formats == 0, dates.strftime('%Y-%m-%d'),
+        np.where(
+            formats == 1, dates.strftime('%Y-%m-%d %H:%M:%S'),
+            np.where(formats == 2, dates.strftime('%Y-%m-%dT%H:%M:%S-05:00'),
+                     dates.strftime('%Y-%m-%dT%H:%M:%S-04:00'))
+        )
+    ).astype(object)
+
+
+def belongs_to_valdor_rowwise(row):
+    """Ancien filtre ligne par ligne (copié pour comparaison)"""
+    address = normalize_text(row.get("ADR_CIV_LIEU", ""))
+    mrc = normalize_text(row.get("LST_MRC_REG_ADM", ""))
+    if any(keyword in address for keyword in ["VAL-D'OR", "VAL D'OR", "VALDOR"]):
+        return True
+    return "LA VALLÉE-DE-L'OR" in mrc and "VAL" in address
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    print(f"Génération d'une couche synthétique de {count} lignes...")
+    raw = generate_layer(count)
+    raw_mb = memory_mb(raw)
+    print(f"Mémoire colonnes objet: {raw_mb:.1f} Mo")
+
+    start = time.perf_counter()
+    typed = apply_ingest_schema(raw.copy())
+    schema_ms = (time.perf_counter() - start) * 1000
+    typed_mb = memory_mb(typed)
+    print(f"Mémoire schéma typé: {typed_mb:.1f} Mo (application: {schema_ms:.0f} ms)")
+    print(f"Réduction mémoire: {(raw_mb - typed_mb) / raw_mb * 100:.1f}%")
+    assert typed['DATE_CRE_MAJ'].notna().all(), "Toutes les dates (décalages mixtes inclus) doivent être parsées"
+
+    start = time.perf_counter()
+    rowwise = raw.apply(belongs_to_valdor_rowwise, axis=1).to_numpy(dtype=bool)
+    rowwise_ms = (time.perf_counter() - start) * 1000
+    print(f"Filtre ligne par ligne: {rowwise_ms:.0f} ms")
+
+    start = time.perf_counter()
+    vectorized = valdor_mask(typed)
+    vectorized_ms = (time.perf_counter() - start) * 1000
+    print(f"Filtre vectorisé (codes de catégories): {vectorized_ms:.0f} ms")
+
+    assert (rowwise == vectorized).all(), "Les deux filtres doivent retourner le même masque"
+    print(f"Terrains retenus: {int(vectorized.sum())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire et temps de diff: dicts + json.dumps (ancien format)
+vs SiteRecord + comparaison de tuples, sur un ensemble multi-municipalités.
+
+Usage: python benchmarks/record_diff_bench.py [nombre_de_terrains]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sync_government_data import FICHE_URL_TEMPLATE, SiteRecord, detect_changes  # noqa: E402
+
+MRC_VALUES = ["La Vallée-de-l'Or (08)", "Rouyn-Noranda (08)", "Montréal (06)", "Québec (03)"]
+ETAT_VALUES = ['Terminée', 'Non terminée', 'Non nécessaire', '']
+QUAL_VALUES = ['<= A', 'A-B', 'B-C', '> C', '']
+
+
+def generate_dicts(count, modified_every=50):
+    """Générer des terrains au format dict (tel que lu depuis Firestore)"""
+    data = []
+    for i in range(count):
+        dossiers = [str(100000 + i), str(200000 + i)]
+        etat = ETAT_VALUES[i % len(ETAT_VALUES)]
+        data.append({
+            'NO_MEF_LIEU': 7000000 + i,
+            'LATITUDE': 45.0 + (i % 1000) * 0.001,
+            'LONGITUDE': -73.0 - (i % 1000) * 0.001,
+            'ADR_CIV_LIEU': f"{i} rue Principale",
+            'CODE_POST_LIEU': 'J9P 1A1',
+            'LST_MRC_REG_ADM': MRC_VALUES[i % len(MRC_VALUES)],
+            'DESC_MILIEU_RECEPT': 'Sol',
+            'NB_FICHES': 2 + (1 if modified_every and i % modified_every == 0 else 0),
+            'NO_SEQ_DOSSIER': ', '.join(dossiers),
+            'ETAT_REHAB': etat,
+            'QUAL_SOLS_AV': QUAL_VALUES[i % len(QUAL_VALUES)],
+            'QUAL_SOLS': QUAL_VALUES[(i + 1) % len(QUAL_VALUES)],
+            'CONTAM_SOL_EXTRA': 'Hydrocarbures pétroliers C10 à C50',
+            'CONTAM_EAU_EXTRA': '',
+            'DATE_CRE_MAJ': '2020-01-01',
+            'FICHES_URLS': [FICHE_URL_TEMPLATE.format(d) for d in dossiers],
+            'IS_DECONTAMINATED': 'Terminée' in etat,
+        })
+    return data
+
+
+def detect_changes_dicts(old_data, new_data):
+    """Ancienne détection des changements (copiée pour comparaison)"""
+    old_map = {str(item.get('NO_MEF_LIEU')): item for item in old_data if item.get('NO_MEF_LIEU')}
+    new_map = {str(item.get('NO_MEF_LIEU')): item for item in new_data if item.get('NO_MEF_LIEU')}
+    new_items = [item for item in new_data if str(item.get('NO_MEF_LIEU')) not in old_map]
+    removed_items = [item for item in old_data if str(item.get('NO_MEF_LIEU')) not in new_map]
+    modified_items = []
+    for item in new_data:
+        ref = str(item.get('NO_MEF_LIEU'))
+        if ref in old_map:
+            if json.dumps(old_map[ref], sort_keys=True) != json.dumps(item, sort_keys=True):
+                modified_items.append(item)
+    return {'new': new_items, 'modified': modified_items, 'removed': removed_items}
+
+
+def measure_memory(build):
+    """Mémoire allouée (Mo) par les objets construits par build()"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / (1024 * 1024)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"Génération de {count} terrains (ancien et nouvel état)...")
+    old_source = generate_dicts(count, modified_every=0)
+    new_source = generate_dicts(count)
+
+    old_dicts, dicts_mb = measure_memory(lambda: json.loads(json.dumps(old_source)))
+    old_records, records_mb = measure_memory(
+        lambda: [SiteRecord.from_dict(item) for item in json.loads(json.dumps(old_source))]
+    )
+    print(f"Mémoire dicts: {dicts_mb:.1f} Mo ({dicts_mb * 1024 * 1024 / count:.0f} octets/terrain)")
+    print(f"Mémoire SiteRecord: {records_mb:.1f} Mo ({records_mb * 1024 * 1024 / count:.0f} octets/terrain)")
+    print(f"Réduction mémoire: {(dicts_mb - records_mb) / dicts_mb * 100:.1f}%")
+
+    new_records = [SiteRecord.from_dict(item) for item in new_source]
+    logging.disable(logging.INFO)
+
+    start = time.perf_counter()
+    dict_changes = detect_changes_dicts(old_dicts, new_source)
+    dicts_ms = (time.perf_counter() - start) * 1000
+    print(f"Diff dicts + json.dumps: {dicts_ms:.0f} ms")
+
+    start = time.perf_counter()
+    record_changes = detect_changes(old_records, new_records)
+    records_ms = (time.perf_counter() - start) * 1000
+    print(f"Diff SiteRecord + tuples: {records_ms:.0f} ms")
+    print(f"Accélération: {dicts_ms / records_ms:.1f}x")
+
+    logging.disable(logging.NOTSET)
+    for kind in ('new', 'modified', 'removed'):
+        assert len(dict_changes[kind]) == len(record_changes[kind]), kind
+    print(f"Terrains modifiés: {len(record_changes['modified'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,15 @@ Télécharge le fichier GPKG depuis données Québec, filtre pour Val-d'Or,
 détecte les changements et met à jour Firebase.
 """
 
+import argparse
 import os
 import sys
 import json
 import requests
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+from scipy.spatial import cKDTree
 from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, firestore
@@ -35,6 +38,251 @@ MUNICIPALITY = "Val-d'Or"
 GOVERNMENT_DATA_COLLECTION = 'government_data'
 SYNC_METADATA_COLLECTION = 'sync_metadata'
 
+# Index spatial (rayons en mètres)
+EARTH_RADIUS_M = 6371008.8
+DUPLICATE_RADIUS_M = 25
+MOVED_RADIUS_M = 100
+NEIGHBOUR_RADIUS_M = 500
+
+# Schéma typé appliqué à la lecture des couches 'point' et 'detailsFiches'
+CATEGORICAL_COLUMNS = (
+    'LST_MRC_REG_ADM',
+    'ETAT_REHAB',
+    'DESC_MILIEU_RECEPT',
+    'QUAL_SOLS',
+    'QUAL_SOLS_AV',
+)
+INTEGER_COLUMNS = ('NO_MEF_LIEU', 'NB_FICHES')
+DATETIME_COLUMNS = ('DATE_CRE_MAJ',)
+
+# Fuseau local des dates (heure de l'Est, -05:00 / -04:00 selon l'heure avancée)
+LOCAL_TIMEZONE = 'America/Toronto'
+UTC_OFFSET_PATTERN = r'\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}:?\d{2})$'
+
+# Mots-clés d'adresse identifiant Val-d'Or
+VALDOR_ADDRESS_KEYWORDS = ("VAL-D'OR", "VAL D'OR", "VALDOR")
+VALDOR_MRC = "LA VALLÉE-DE-L'OR"
+
+# URL des fiches officielles (une par dossier)
+FICHE_URL_TEMPLATE = "https://www.environnement.gouv.qc.ca/sol/terrains/terrains-contamines/fiche.asp?no={}"
+
+# Champs d'un terrain, dans l'ordre d'écriture vers Firestore.
+# FICHES_URLS n'est pas stocké: il est dérivé de NO_SEQ_DOSSIER.
+RECORD_FIELDS = (
+    'NO_MEF_LIEU',
+    'LATITUDE',
+    'LONGITUDE',
+    'ADR_CIV_LIEU',
+    'CODE_POST_LIEU',
+    'LST_MRC_REG_ADM',
+    'DESC_MILIEU_RECEPT',
+    'NB_FICHES',
+    'NO_SEQ_DOSSIER',
+    'ETAT_REHAB',
+    'QUAL_SOLS_AV',
+    'QUAL_SOLS',
+    'CONTAM_SOL_EXTRA',
+    'CONTAM_EAU_EXTRA',
+    'DATE_CRE_MAJ',
+    'IS_DECONTAMINATED',
+)
+
+# Champs à faible cardinalité dont les chaînes sont internées
+INTERNED_FIELDS = frozenset({
+    'CODE_POST_LIEU',
+    'LST_MRC_REG_ADM',
+    'DESC_MILIEU_RECEPT',
+    'ETAT_REHAB',
+    'QUAL_SOLS_AV',
+    'QUAL_SOLS',
+    'DATE_CRE_MAJ',
+})
+
+RECORD_DEFAULTS = {
+    'NO_MEF_LIEU': None,
+    'LATITUDE': 0.0,
+    'LONGITUDE': 0.0,
+    'NB_FICHES': 0,
+    'IS_DECONTAMINATED': False,
+}
+
+
+class SiteRecord:
+    """Terrain compact (slots + chaînes internées) utilisé par le diff et l'écriture.
+
+    Converti en dict uniquement à la frontière Firestore via ``to_dict()``.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, **values):
+        for field in RECORD_FIELDS:
+            value = values.get(field, RECORD_DEFAULTS.get(field, ''))
+            if isinstance(value, np.generic):
+                value = value.item()
+            if not isinstance(value, (str, int, float, bool, type(None))):
+                value = str(value)
+            if field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, item):
+        """Construire un terrain depuis un dict (Firestore ou ancien format)"""
+        return cls(**{field: item[field] for field in RECORD_FIELDS if field in item})
+
+    @property
+    def key(self):
+        """Clé de comparaison (NO_MEF_LIEU en texte), None si absente"""
+        return str(self.NO_MEF_LIEU) if self.NO_MEF_LIEU else None
+
+    @property
+    def fiches_urls(self):
+        """URLs des fiches dérivées de NO_SEQ_DOSSIER"""
+        return [
+            FICHE_URL_TEMPLATE.format(d.strip())
+            for d in self.NO_SEQ_DOSSIER.split(', ')
+            if d and d.strip() and d.strip() != 'nan'
+        ]
+
+    def values(self):
+        """Tuple des valeurs, utilisé pour la comparaison et le hachage"""
+        return tuple(getattr(self, field) for field in RECORD_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, SiteRecord):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def to_dict(self):
+        """Convertir en dict pour Firestore"""
+        record = {field: getattr(self, field) for field in RECORD_FIELDS}
+        record['FICHES_URLS'] = self.fiches_urls
+        return record
+
+
+def geolocated_sites(records):
+    """Terrains indexables: clé NO_MEF_LIEU unique et coordonnées finies non nulles.
+
+    Retourne (terrains, latitudes, longitudes).
+    """
+    keyed = {}
+    duplicates = set()
+    for record in records:
+        if not record.key:
+            continue
+        if record.key in keyed:
+            duplicates.add(record.key)
+            continue
+        keyed[record.key] = record
+    if duplicates:
+        logger.warning(f"⚠️ NO_MEF_LIEU en double ignorés dans l'index spatial: {sorted(duplicates)}")
+    
+    sites = list(keyed.values())
+    latitudes = pd.to_numeric(pd.Series([r.LATITUDE for r in sites], dtype=object), errors='coerce')
+    longitudes = pd.to_numeric(pd.Series([r.LONGITUDE for r in sites], dtype=object), errors='coerce')
+    latitudes = latitudes.to_numpy(dtype=float)
+    longitudes = longitudes.to_numpy(dtype=float)
+    valid = np.isfinite(latitudes) & np.isfinite(longitudes) & (latitudes != 0) & (longitudes != 0)
+    return [r for r, ok in zip(sites, valid) if ok], latitudes[valid], longitudes[valid]
+
+
+class SiteSpatialIndex:
+    """Index KD-tree des terrains sur coordonnées projetées en mètres.
+
+    Projection équirectangulaire locale centrée sur la latitude moyenne,
+    suffisante à l'échelle d'une municipalité. Seuls les terrains retenus
+    par ``geolocated_sites`` sont indexés.
+    """
+
+    def __init__(self, records):
+        self.records, self.latitudes, self.longitudes = geolocated_sites(records)
+        self.ref_lat = float(self.latitudes.mean()) if len(self.latitudes) else 0.0
+        self.points = self.project(self.latitudes, self.longitudes)
+        self.tree = cKDTree(self.points)
+
+    def __len__(self):
+        return len(self.records)
+
+    def project(self, latitudes, longitudes):
+        """Projeter des latitudes/longitudes (degrés) en x/y (mètres)"""
+        lat = np.radians(np.asarray(latitudes, dtype=float))
+        lon = np.radians(np.asarray(longitudes, dtype=float))
+        x = EARTH_RADIUS_M * lon * np.cos(np.radians(self.ref_lat))
+        y = EARTH_RADIUS_M * lat
+        return np.column_stack([x, y])
+
+    def within(self, latitude, longitude, radius_m):
+        """Terrains à moins de radius_m mètres d'un point, triés par distance"""
+        point = self.project([latitude], [longitude])[0]
+        indices = np.asarray(self.tree.query_ball_point(point, radius_m), dtype=int)
+        distances = np.linalg.norm(self.points[indices] - point, axis=1)
+        order = np.argsort(distances)
+        return [(self.records[indices[i]], float(distances[i])) for i in order]
+
+    def near_duplicates(self, radius_m=DUPLICATE_RADIUS_M):
+        """Paires de terrains distincts situés à moins de radius_m mètres"""
+        pairs = self.tree.query_pairs(radius_m, output_type='ndarray')
+        distances = np.linalg.norm(self.points[pairs[:, 0]] - self.points[pairs[:, 1]], axis=1)
+        return [
+            {
+                'NO_MEF_LIEU': [self.records[i].key, self.records[j].key],
+                'distance_m': round(float(d), 1)
+            }
+            for (i, j), d in zip(pairs, distances)
+        ]
+
+    def neighbour_table(self, radius_m=NEIGHBOUR_RADIUS_M):
+        """Voisins de chaque terrain à moins de radius_m mètres, triés par distance"""
+        matrix = self.tree.sparse_distance_matrix(self.tree, radius_m, output_type='ndarray')
+        matrix = matrix[matrix['i'] != matrix['j']]
+        matrix = matrix[np.lexsort((matrix['v'], matrix['i']))]
+        
+        table = {}
+        starts = np.flatnonzero(np.diff(matrix['i'], prepend=-1))
+        for rows in np.split(matrix, starts[1:]):
+            if not len(rows):
+                continue
+            table[self.records[rows['i'][0]].key] = [
+                {'NO_MEF_LIEU': self.records[j].key, 'distance_m': round(float(d), 1)}
+                for j, d in zip(rows['j'], rows['v'])
+            ]
+        return table
+
+
+def link_moved_sites(removed_items, new_items, radius_m=MOVED_RADIUS_M):
+    """Relier les terrains retirés aux nouveaux terrains proches (déplacés ou réenregistrés).
+
+    Appariement un-à-un: les paires les plus proches sont retenues en premier,
+    chaque terrain retiré ou nouveau n'apparaît que dans un seul lien.
+    """
+    new_index = SiteSpatialIndex(new_items)
+    removed_index = SiteSpatialIndex(removed_items)
+    if not len(new_index) or not len(removed_index):
+        return []
+    
+    # Projeter les terrains retirés dans le même repère que les nouveaux
+    removed_tree = cKDTree(new_index.project(removed_index.latitudes, removed_index.longitudes))
+    candidates = removed_tree.sparse_distance_matrix(new_index.tree, radius_m, output_type='ndarray')
+    candidates = candidates[np.argsort(candidates['v'], kind='stable')]
+    
+    links = []
+    used_removed, used_new = set(), set()
+    for i, j, d in zip(candidates['i'], candidates['j'], candidates['v']):
+        if i in used_removed or j in used_new:
+            continue
+        used_removed.add(i)
+        used_new.add(j)
+        links.append({
+            'from': removed_index.records[i].key,
+            'to': new_index.records[j].key,
+            'distance_m': round(float(d), 1)
+        })
+    return links
+
 
 def initialize_firebase():
     """Initialiser Firebase Admin SDK"""
@@ -114,18 +362,81 @@ def normalize_text(text):
     return str(text).upper().strip()
 
 
-def belongs_to_valdor(row):
-    """Vérifier si un terrain appartient à Val-d'Or"""
-    address = normalize_text(row.get("ADR_CIV_LIEU", ""))
-    mrc = normalize_text(row.get("LST_MRC_REG_ADM", ""))
+def downcast_integer(series):
+    """Réduire une colonne numérique entière au plus petit type (texte ou non entière: inchangée)"""
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    numeric = series
+    present = numeric.notna()
+    if (numeric[present] % 1 != 0).any():
+        return series
+    if present.all():
+        return pd.to_numeric(numeric, downcast='integer')
+    return pd.to_numeric(numeric.astype('Int64'), downcast='integer')
+
+
+def parse_local_datetimes(raw):
+    """Parser des dates en heure locale naïve.
+
+    Les valeurs avec décalage UTC (-05:00, -04:00, Z...) sont converties vers
+    LOCAL_TIMEZONE; les valeurs sans décalage sont déjà considérées locales.
+    """
+    text = raw.astype('string').str.strip()
+    has_offset = text.str.contains(UTC_OFFSET_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
     
-    if any(keyword in address for keyword in ["VAL-D'OR", "VAL D'OR", "VALDOR"]):
-        return True
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+    if has_offset.any():
+        aware = pd.to_datetime(text[has_offset], format='mixed', errors='coerce', utc=True)
+        parsed[has_offset] = aware.dt.tz_convert(LOCAL_TIMEZONE).dt.tz_localize(None)
+    if (~has_offset).any():
+        parsed[~has_offset] = pd.to_datetime(text[~has_offset], format='mixed', errors='coerce')
+    return parsed
+
+
+def apply_ingest_schema(df):
+    """Typer une couche GTC: catégories, entiers réduits et dates parsées une seule fois"""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            df[column] = downcast_integer(df[column])
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            raw = df[column]
+            df[column] = parse_local_datetimes(raw)
+            provided = raw.notna() & (raw.astype(str).str.strip() != '')
+            unparsed = int((provided & df[column].isna()).sum())
+            if unparsed:
+                logger.warning(f"⚠️ {unparsed} valeurs {column} non reconnues comme dates")
+    return df
+
+
+def category_contains(series, keyword):
+    """Tester un mot-clé sur les catégories normalisées puis propager via les codes"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    hits = np.array([keyword in normalize_text(c) for c in series.cat.categories] + [False])
+    # Le code -1 (valeur manquante) pointe sur le False ajouté en fin de tableau
+    return pd.Series(hits[series.cat.codes.to_numpy()], index=series.index)
+
+
+def valdor_mask(points_df):
+    """Masque des terrains appartenant à Val-d'Or (vectorisé)"""
+    if 'ADR_CIV_LIEU' in points_df.columns:
+        address = points_df['ADR_CIV_LIEU'].astype('string').fillna('').str.upper().str.strip()
+    else:
+        address = pd.Series('', index=points_df.index, dtype='string')
     
-    if "LA VALLÉE-DE-L'OR" in mrc and "VAL" in address:
-        return True
+    mask = pd.Series(False, index=points_df.index)
+    for keyword in VALDOR_ADDRESS_KEYWORDS:
+        mask |= address.str.contains(keyword, regex=False)
     
-    return False
+    if 'LST_MRC_REG_ADM' in points_df.columns:
+        in_mrc = category_contains(points_df['LST_MRC_REG_ADM'], VALDOR_MRC)
+        mask |= in_mrc & address.str.contains("VAL", regex=False)
+    
+    return mask.to_numpy(dtype=bool)
 
 
 def filter_valdor_data(gpkg_path):
@@ -169,7 +480,7 @@ def filter_valdor_data(gpkg_path):
     
     def extract_scalar(val):
         """Extraire une valeur scalaire depuis n'importe quel type"""
-        if val is None:
+        if val is None or val is pd.NA:
             return None
         if isinstance(val, (str, int, float, bool)):
             return val
@@ -212,10 +523,10 @@ def filter_valdor_data(gpkg_path):
             raise ValueError("Couche 'point' non trouvée dans le GPKG")
         
         logger.info("📖 Lecture de la couche 'point'...")
-        points_df = gpd.read_file(gpkg_path, layer='point')
+        points_df = apply_ingest_schema(gpd.read_file(gpkg_path, layer='point'))
         logger.info(f"📊 Total de points: {len(points_df)}")
         
-        valdor_points = points_df[points_df.apply(belongs_to_valdor, axis=1)].copy()
+        valdor_points = points_df[valdor_mask(points_df)].copy()
         logger.info(f"✅ Points pour Val-d'Or: {len(valdor_points)}")
         
         if 'detailsFiches' not in layers:
@@ -223,12 +534,15 @@ def filter_valdor_data(gpkg_path):
             fiches_df = pd.DataFrame()
         else:
             logger.info("📖 Lecture de la couche 'detailsFiches'...")
-            fiches_df = gpd.read_file(gpkg_path, layer='detailsFiches')
+            fiches_df = apply_ingest_schema(gpd.read_file(gpkg_path, layer='detailsFiches'))
             logger.info(f"📊 Total de fiches: {len(fiches_df)}")
         
         fiches_dict = {}
         if not fiches_df.empty and 'NO_MEF_LIEU' in fiches_df.columns:
-            logger.info("🔗 Agrégation des fiches par terrain...")
+            # Restreindre aux terrains de Val-d'Or avant l'agrégation
+            valdor_keys = set(valdor_points['NO_MEF_LIEU'].dropna().astype(str))
+            fiches_df = fiches_df[fiches_df['NO_MEF_LIEU'].astype(str).isin(valdor_keys)]
+            logger.info(f"🔗 Agrégation de {len(fiches_df)} fiches par terrain...")
             fiches_grouped = fiches_df.groupby('NO_MEF_LIEU').agg({
                 'NO_SEQ_DOSSIER': lambda x: ', '.join(str(v) for v in x if pd.notna(v)),
                 'ETAT_REHAB': lambda x: ' | '.join(str(v) for v in x if pd.notna(v) and v),
@@ -236,7 +550,7 @@ def filter_valdor_data(gpkg_path):
                 'QUAL_SOLS': lambda x: ', '.join(str(v) for v in x if pd.notna(v) and v),
                 'CONTAM_SOL_EXTRA': lambda x: '; '.join(str(v) for v in x if pd.notna(v) and v),
                 'CONTAM_EAU_EXTRA': lambda x: '; '.join(str(v) for v in x if pd.notna(v) and v),
-                'DATE_CRE_MAJ': lambda x: max([v for v in x if pd.notna(v)], default=None)
+                'DATE_CRE_MAJ': 'max'
             }).reset_index()
             
             for _, row in fiches_grouped.iterrows():
@@ -285,12 +599,6 @@ def filter_valdor_data(gpkg_path):
                 else:
                     record['DATE_CRE_MAJ'] = ''
                 
-                dossiers = record['NO_SEQ_DOSSIER'].split(', ')
-                record['FICHES_URLS'] = [
-                    f"https://www.environnement.gouv.qc.ca/sol/terrains/terrains-contamines/fiche.asp?no={d.strip()}"
-                    for d in dossiers if d and d.strip() and d.strip() != 'nan'
-                ]
-                
                 record['IS_DECONTAMINATED'] = 'Terminée' in record['ETAT_REHAB']
             else:
                 record.update({
@@ -301,16 +609,11 @@ def filter_valdor_data(gpkg_path):
                     'CONTAM_SOL_EXTRA': '',
                     'CONTAM_EAU_EXTRA': '',
                     'DATE_CRE_MAJ': '',
-                    'FICHES_URLS': [],
                     'IS_DECONTAMINATED': False
                 })
             
-            # Validation finale
-            for key, value in list(record.items()):
-                if not isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                    record[key] = str(value)
-            
-            data_list.append(record)
+            # Validation finale (types non sérialisables convertis en texte)
+            data_list.append(SiteRecord(**record))
         
         logger.info(f"✅ {len(data_list)} enregistrements complets pour Val-d'Or")
         return data_list
@@ -331,7 +634,7 @@ def load_existing_data(db):
         
         if doc.exists:
             data = doc.to_dict()
-            existing_data = data.get('data', [])
+            existing_data = [SiteRecord.from_dict(item) for item in data.get('data', [])]
             logger.info(f"✅ {len(existing_data)} enregistrements existants chargés")
             return existing_data
         else:
@@ -347,29 +650,29 @@ def detect_changes(old_data, new_data):
     try:
         logger.info("🔍 Détection des changements...")
         
-        old_map = {str(item.get('NO_MEF_LIEU')): item for item in old_data if item.get('NO_MEF_LIEU')}
-        new_map = {str(item.get('NO_MEF_LIEU')): item for item in new_data if item.get('NO_MEF_LIEU')}
+        old_map = {item.key: item for item in old_data if item.key}
+        new_map = {item.key: item for item in new_data if item.key}
         
-        new_items = [item for item in new_data if str(item.get('NO_MEF_LIEU')) not in old_map]
-        removed_items = [item for item in old_data if str(item.get('NO_MEF_LIEU')) not in new_map]
+        new_items = [item for item in new_data if item.key not in old_map]
+        removed_items = [item for item in old_data if item.key not in new_map]
         
-        modified_items = []
-        for item in new_data:
-            ref = str(item.get('NO_MEF_LIEU'))
-            if ref in old_map:
-                if json.dumps(old_map[ref], sort_keys=True) != json.dumps(item, sort_keys=True):
-                    modified_items.append(item)
+        modified_items = [
+            item for item in new_data
+            if item.key in old_map and old_map[item.key] != item
+        ]
         
         changes = {
             'new': new_items,
             'modified': modified_items,
-            'removed': removed_items
+            'removed': removed_items,
+            'moved': link_moved_sites(removed_items, new_items)
         }
         
         logger.info(f"📊 Changements détectés:")
         logger.info(f"   - Nouveaux: {len(new_items)}")
         logger.info(f"   - Modifiés: {len(modified_items)}")
         logger.info(f"   - Retirés: {len(removed_items)}")
+        logger.info(f"   - Déplacés (retiré relié à un nouveau): {len(changes['moved'])}")
         
         return changes
     except Exception as e:
@@ -384,7 +687,7 @@ def update_firebase(db, data, changes):
         
         doc_ref = db.collection(GOVERNMENT_DATA_COLLECTION).document('current')
         doc_ref.set({
-            'data': data,
+            'data': [record.to_dict() for record in data],
             'lastUpdate': datetime.now().isoformat(),
             'count': len(data)
         })
@@ -397,8 +700,10 @@ def update_firebase(db, data, changes):
             'changes': {
                 'new': len(changes['new']),
                 'modified': len(changes['modified']),
-                'removed': len(changes['removed'])
+                'removed': len(changes['removed']),
+                'moved': len(changes['moved'])
             },
+            'moved_sites': changes['moved'],
             'total_records': len(data),
             'lastUpdate': datetime.now().isoformat()
         }
@@ -413,6 +718,33 @@ def update_firebase(db, data, changes):
         raise
 
 
+def publish_spatial_index(db, data):
+    """Publier la table des voisins et les doublons probables dans Firebase"""
+    try:
+        logger.info("🗺️ Construction de l'index spatial...")
+        index = SiteSpatialIndex(data)
+        near_duplicates = index.near_duplicates()
+        neighbours = index.neighbour_table()
+        
+        logger.info(f"📍 {len(index)} terrains géolocalisés")
+        logger.info(f"⚠️ {len(near_duplicates)} doublons probables (< {DUPLICATE_RADIUS_M} m)")
+        
+        doc_ref = db.collection(GOVERNMENT_DATA_COLLECTION).document('neighbours')
+        doc_ref.set({
+            'radius_m': NEIGHBOUR_RADIUS_M,
+            'duplicate_radius_m': DUPLICATE_RADIUS_M,
+            'neighbours': neighbours,
+            'near_duplicates': near_duplicates,
+            'lastUpdate': datetime.now().isoformat()
+        })
+        
+        logger.info(f"✅ Table des voisins sauvegardée ({len(neighbours)} terrains)")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur publication index spatial: {e}")
+        return False
+
+
 def cleanup_temp_files(file_path, temp_dir=None):
     """Nettoyer les fichiers temporaires"""
     try:
@@ -428,6 +760,28 @@ def cleanup_temp_files(file_path, temp_dir=None):
         logger.warning(f"⚠️ Erreur suppression fichiers temporaires: {e}")
 
 
+def find_sites_near(latitude, longitude, radius_m):
+    """Afficher les terrains à moins de radius_m mètres d'un point (données Firebase courantes)"""
+    try:
+        db = initialize_firebase()
+        # Lecture directe: un échec ne doit jamais passer pour « aucun terrain à proximité »
+        doc = db.collection(GOVERNMENT_DATA_COLLECTION).document('current').get()
+        if not doc.exists:
+            raise ValueError(f"Document {GOVERNMENT_DATA_COLLECTION}/current introuvable")
+        
+        records = [SiteRecord.from_dict(item) for item in doc.to_dict().get('data', [])]
+        index = SiteSpatialIndex(records)
+        sites = index.within(latitude, longitude, radius_m)
+        
+        logger.info(f"📍 {len(sites)} terrains à moins de {radius_m:.0f} m de ({latitude}, {longitude})")
+        for record, distance in sites:
+            logger.info(f"   - {distance:8.1f} m  {record.NO_MEF_LIEU}  {record.ADR_CIV_LIEU}")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ Erreur recherche de proximité: {e}")
+        return 1
+
+
 def main():
     """Fonction principale"""
     gpkg_file = None
@@ -443,6 +797,7 @@ def main():
         old_data = load_existing_data(db)
         changes = detect_changes(old_data, new_data)
         update_firebase(db, new_data, changes)
+        publish_spatial_index(db, new_data)
         
         logger.info("✅ Synchronisation terminée avec succès!")
         logger.info("\n📊 RÉSUMÉ:")
@@ -450,6 +805,7 @@ def main():
         logger.info(f"   Nouveaux: {len(changes['new'])}")
         logger.info(f"   Modifiés: {len(changes['modified'])}")
         logger.info(f"   Retirés: {len(changes['removed'])}")
+        logger.info(f"   Déplacés: {len(changes['moved'])}")
         
         return 0
         
@@ -475,4 +831,17 @@ def main():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Synchronisation des données gouvernementales")
+    parser.add_argument(
+        '--near', nargs=2, type=float, metavar=('LATITUDE', 'LONGITUDE'),
+        help="Lister les terrains proches d'un point au lieu de synchroniser"
+    )
+    parser.add_argument(
+        '--radius', type=float, default=NEIGHBOUR_RADIUS_M,
+        help=f"Rayon de recherche en mètres pour --near (défaut: {NEIGHBOUR_RADIUS_M})"
+    )
+    args = parser.parse_args()
+    
+    if args.near:
+        sys.exit(find_sites_near(args.near[0], args.near[1], args.radius))
     sys.exit(main())